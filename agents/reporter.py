@@ -1,39 +1,105 @@
-import json
+import asyncio
+import hashlib
 from typing import Dict, Any, List
 from langchain_core.messages import HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
 import os
 from datetime import datetime
-from .utils import log_emoji
+from .utils import log_emoji, get_llm, atomic_write, parse_event_date, json_dumps, JsonCache, event_key
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Cached formatter responses expire after a week so stale reports roll over
+FORMAT_CACHE_TTL = 7 * 24 * 60 * 60
+
+# Days covered by the weekly report, in output order
+REPORT_DAYS = ["MONDAY", "TUESDAY", "WEDNESDAY", "THURSDAY", "FRIDAY"]
+
+# Event fields the formatter needs; the day is already given by the grouping
+PROMPT_EVENT_FIELDS = ("title", "url", "location", "type")
+
+# Static formatting instructions. Nothing run-specific (dates, week numbers)
+# may be interpolated here, so the prompt prefix is identical on every call.
+FORMAT_PROMPT_PREFIX = """Format these AI events for Discord using this EXACT format:
+**[[Title]](URL)** (TYPE)[Category]
+
+Rules:
+1. Title should be clean, no markdown except the outer **
+2. URL must be included
+3. TYPE should be one of: INPERSON, ONLINE, or HYBRID
+4. Category should be one of: [Tech Session], [Workshop], [Conference], [Meetup], [Hackathon]
+5. Events are already grouped by day of the week; keep every event under its day, in the given order
+6. Each day must start with a header in the format: **[DAY]** (e.g. **[MONDAY]**, **[TUESDAY]**, etc.)
+7. No descriptions, no dates, no times
+8. No additional text or comments
+9. Include ALL days from Monday to Friday, writing (no events) under days without events
+
+Example format:
+**[MONDAY]**
+**[[AI Performance Engineering Meetup]](https://example.com/event)** (INPERSON)[Tech Session]
+
+**[TUESDAY]**
+**[[ML Workshop]](https://example.com/workshop)** (ONLINE)[Workshop]
+
+**[WEDNESDAY]**
+(no events)
+
+**[THURSDAY]**
+**[[AI Conference]](https://example.com/conference)** (INPERSON)[Conference]
+
+**[FRIDAY]**
+(no events)"""
+
 class ReporterAgent:
     def __init__(self):
         self.results_dir = "./results"
         os.makedirs(self.results_dir, exist_ok=True)
         self.output_file = "discord_events.txt"
+        self.format_cache = JsonCache(os.path.join(self.results_dir, ".format_cache.json"), FORMAT_CACHE_TTL)
         
         # Validate OpenAI API key
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("OPENAI_API_KEY environment variable is not set")
         
         # Initialize OpenAI model for event formatting
-        self.llm = ChatOpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="gpt-4-turbo-preview"  # Using GPT-4 for better formatting
-        )
+        self.llm = get_llm("gpt-4o-mini")  # Layout follows the fixed rules in the prompt
     
     def _save_to_file(self, formatted_events: str):
         """Save formatted events to file."""
         try:
-            with open(self.output_file, "w") as f:
-                f.write(formatted_events)
+            atomic_write(self.output_file, formatted_events)
             logger.info(f"💾 Reporter: Output saved to {self.output_file}")
         except Exception as e:
             logger.error(f"Error saving output: {str(e)}")
     
+    def _dedupe_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop events already seen by URL, or by title and date when there is no URL."""
+        seen = set()
+        unique_events = []
+        for event in events:
+            key = event_key(event)
+            if key not in seen:
+                seen.add(key)
+                unique_events.append(event)
+        return unique_events
+    
+    def _group_events_by_day(self, events: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group events under the weekday they take place on."""
+        events_by_day = {day: [] for day in REPORT_DAYS}
+        for event in events:
+            event_date = parse_event_date(event.get("date"))
+            day = event_date.strftime("%A").upper() if event_date else None
+            if day not in events_by_day:
+                logger.warning(f"Reporter: Skipping event outside the work week: {event.get('title')}")
+                continue
+            events_by_day[day].append(event)
+        return events_by_day
+    
+    def _format_cache_key(self, events: Dict[str, List[Dict[str, Any]]], current_week: int) -> str:
+        """Hash the canonicalized events payload together with the current week."""
+        payload = json_dumps(events, sort_keys=True).encode() + str(current_week).encode()
+        return hashlib.sha256(payload).hexdigest()
+    
     def format_events(self, events: List[Dict[str, Any]]) -> str:
         """Format events for Discord output."""
         log_emoji("✍️", "Reporter: Formatting events")
@@ -41,52 +107,36 @@ class ReporterAgent:
             # Get current week number
             current_week = datetime.now().isocalendar()[1]
             
-            # Use LLM to format events
-            prompt = f"""Format these AI events for Discord using this EXACT format:
-            **[[Title]](URL)** (TYPE)[Category]
-
-            Rules:
-            1. Title should be clean, no markdown except the outer **
-            2. URL must be included
-            3. TYPE should be one of: INPERSON, ONLINE, or HYBRID
-            4. Category should be one of: [Tech Session], [Workshop], [Conference], [Meetup], [Hackathon]
-            5. Group events by day of the week
-            6. Each day must start with a header in the format: **[DAY]** (e.g. **[MONDAY]**, **[TUESDAY]**, etc.)
-            7. No descriptions, no dates, no times
-            8. No additional text or comments
-            9. Events must be grouped under their correct day of the week
-            10. If multiple events have the same URL, only include one entry (the first one encountered)
-            11. IMPORTANT: May 19, 2025 is a MONDAY. Map the days correctly:
-                - May 19, 2025 = MONDAY
-                - May 20, 2025 = TUESDAY
-                - May 21, 2025 = WEDNESDAY
-                - May 22, 2025 = THURSDAY
-                - May 23, 2025 = FRIDAY
-            12. Include ALL days from Monday to Friday, even if there are no events for a particular day
-
-            Example format:
-            **[MONDAY]**
-            **[[AI Performance Engineering Meetup]](https://example.com/event)** (INPERSON)[Tech Session]
-
-            **[TUESDAY]**
-            **[[ML Workshop]](https://example.com/workshop)** (ONLINE)[Workshop]
-
-            **[WEDNESDAY]**
-            (no events)
-
-            **[THURSDAY]**
-            **[[AI Conference]](https://example.com/conference)** (INPERSON)[Conference]
-
-            **[FRIDAY]**
-            (no events)
-
-            Events to format:
-            {json.dumps(events, indent=2)}
-
-            Return ONLY the formatted events, with day headers and proper grouping."""
-
-            response = self.llm.invoke(prompt)
-            formatted_content = response.content
+            # Dedup and day grouping are deterministic, so do them here rather than in the prompt
+            events_by_day = self._group_events_by_day(self._dedupe_events(events))
+            
+            # Only send the fields the format needs
+            prompt_events = {
+                day: [{field: event.get(field) for field in PROMPT_EVENT_FIELDS} for event in day_events]
+                for day, day_events in events_by_day.items()
+            }
+            
+            # Re-runs over the same events within the week reuse the last LLM response
+            cache_key = self._format_cache_key(prompt_events, current_week)
+            formatted_content = self.format_cache.get(cache_key)
+            
+            if formatted_content is None:
+                # Fixed instructions go first so the provider can reuse the cached prefix
+                prompt = (
+                    FORMAT_PROMPT_PREFIX
+                    + "\n\nEvents to format, grouped by day:\n"
+                    + json_dumps(prompt_events)
+                    + "\n\nReturn ONLY the formatted events, with day headers and proper grouping."
+                )
+                
+                response = self.llm.invoke(prompt)
+                formatted_content = response.content
+                try:
+                    self.format_cache.set(cache_key, formatted_content)
+                except OSError as e:
+                    logger.warning(f"Reporter: Could not write format cache: {str(e)}")
+            else:
+                log_emoji("♻️", "Reporter: Using cached formatting for unchanged events")
             
             # Add week header
             markdown = f"**==================[ WEEK {current_week} EVENTS ]==================**\n\n"
@@ -98,50 +148,43 @@ class ReporterAgent:
             log_emoji("❌", f"Reporter: Error formatting events: {e}")
             return "Error formatting events"
     
-    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Run the reporter agent."""
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the reporter agent, returning its output as a partial state update."""
         logger.info("✍️ Reporter: Formatting events")
         
+        # Status is left to the supervisor, which reviews in the same step
         try:
             events = state.get("events", [])
             if not events:
                 logger.warning("No events to format")
-                return state
+                return {}
             
-            # Format events
-            formatted_content = self.format_events(events)
+            # Formatting blocks on the LLM, so keep it off the event loop
+            formatted_content = await asyncio.to_thread(self.format_events, events)
             
             # Save to all output files
             self._save_to_file(formatted_content)  # discord_events.txt
             self.save_output(formatted_content)    # events.md and done file
             
-            # Update state
-            state["formatted_events"] = formatted_content
-            state["status"] = "formatted"
-            
-            return state
+            return {"formatted_events": formatted_content}
             
         except Exception as e:
             logger.error(f"❌ Reporter: Error formatting events: {str(e)}")
-            state["status"] = "error"
-            state["error"] = str(e)
-            return state
+            return {"error": str(e)}
     
     def save_output(self, content: str):
         log_emoji("💾", "Reporter: Saving output")
         try:
             # Save to results file
-            with open(os.path.join(self.results_dir, "events.md"), "w") as f:
-                f.write(content)
+            atomic_write(os.path.join(self.results_dir, "events.md"), content)
             
             # Create done file
-            with open(os.path.join(self.results_dir, "done"), "w") as f:
-                f.write("")
+            atomic_write(os.path.join(self.results_dir, "done"), "")
             
             log_emoji("✅", "Reporter: Output saved successfully")
         except Exception as e:
             log_emoji("❌", f"Reporter: Error saving output: {e}")
     
-    def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    async def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Handle direct calls to the reporter agent."""
-        return self.run(state) 
\ No newline at end of file
+        return await self.run(state) 
\ No newline at end of file
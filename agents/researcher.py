@@ -1,22 +1,125 @@
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, Any, List, Annotated
-from langchain_core.messages import HumanMessage, AIMessage
-from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import TYPE_CHECKING, Dict, Any, List, Annotated, Optional
+import asyncio
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import os
 import re
-from .utils import log_emoji, validate_event, parse_date
+import threading
+from .utils import log_emoji, check_target_range, get_llm, atomic_write, JsonCache, event_key, parse_event_date, json_dumps, json_loads, TARGET_START, TARGET_END
 import logging
-from perplexity import Client
+
+# The Perplexity SDK is only imported once a search thread needs a client
+if TYPE_CHECKING:
+    from perplexity import Client
+
+try:
+    import re2
+except ImportError:
+    re2 = None
 
 logger = logging.getLogger(__name__)
 
+# Rough token estimate used to keep consolidated cleanup prompts a sane size
+CHARS_PER_TOKEN = 4
+MAX_BATCH_TEXT_TOKENS = 8000
+
+# Queries run in concurrent waves, stopping once enough unique events are found
+QUERY_WAVE_SIZE = 3
+TARGET_EVENT_COUNT = 20
+
+# Event listings change slowly, so search answers are reused for a few hours.
+# Set AGIH_CACHE_BUST=1 to ignore cached answers and search again.
+SEARCH_CACHE_TTL = 6 * 60 * 60
+
+# Dates and times pulled out of free-form text in a single scan. RE2 guarantees
+# linear-time matching on long scraped texts when google-re2 is installed.
+_MONTH_DATE = r'(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}'
+_EVENT_DETAILS_RE = (re2 or re).compile(
+    r'(?P<daylong>\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),\s+' + _MONTH_DATE + r'\b)'  # Monday, May 19, 2025
+    r'|(?P<long>\b' + _MONTH_DATE + r'\b)'  # May 19, 2025, also after a weekday without a comma
+    r'|(?P<iso>\b\d{4}-\d{2}-\d{2}\b)'  # 2025-05-19
+    r'|(?P<time>\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)?\b)'  # 18:00, 6:00 PM
+)
+_ORDINAL_RE = re.compile(r'(\d)(?:st|nd|rd|th)\b')
+_URL_RE = re.compile(r'https?://[^\s<>"]+|www\.[^\s<>"]+')
+# Markdown, link prefixes, bullets, quotes and trailing commas stripped from titles in one pass
+_TITLE_STRIP_RE = re.compile(
+    r'^(?:\*\*|\[.*?\]|###\s*|\s*[-•*]\s*|")+'  # Leading bold, [link] prefix, headers, bullets, quotes
+    r'|\(pplx://.*?\)'  # Perplexity links
+    r'|(?:\*\*|"|,\s*)+$'  # Trailing bold, quotes, commas
+)
+
+# Event blocks end at blank lines and start at markdown headers or bold/bulleted titles
+_BLOCK_SPLIT_RE = re.compile(r'\n\s*\n|(?=^[ \t]*(?:###|[-*] \*\*|\*\*))', re.M)
+# Summary blocks and JSON artifacts that never describe a single event
+_SKIP_BLOCK_RE = re.compile(r'summary|overview|note:|while there are|^(?:\{|"answer":)', re.I)
+
+# Keywords that classify an event block, checked in this order
+_WORD_RE = re.compile(r'[a-z]+')
+_EVENT_TYPE_KEYWORDS = [
+    ("Meetup", {"meetup", "meetups", "networking"}),
+    ("Workshop", {"workshop", "workshops", "training", "trainings"}),
+    ("Hackathon", {"hackathon", "hackathons"})
+]
+
+# One connection pool shared by every search client's session, so all workers
+# reuse the same kept-alive TLS connections; retries transient failures with backoff
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5)
+)
+
+# The Perplexity client keeps per-search state, so each search thread gets its own
+_search_clients = threading.local()
+
+def _get_search_client() -> "Client":
+    """Get the calling thread's Perplexity client, creating it on first use."""
+    client = getattr(_search_clients, "client", None)
+    if client is not None:
+        return client
+    
+    from perplexity import Client
+    
+    client = Client()  # Perplexity client automatically uses the API key from environment
+    
+    # Route the client through the shared pool when it talks HTTP through
+    # requests; its own session is kept so headers and cookies survive
+    session = getattr(client, "session", None)
+    if isinstance(session, requests.Session):
+        session.mount("https://", _HTTP_ADAPTER)
+        session.mount("http://", _HTTP_ADAPTER)
+    _search_clients.client = client
+    return client
+
+def _json_str(value: Any) -> Optional[str]:
+    """Get a stripped string field from the LLM's JSON, or None if it is missing or not a string."""
+    if not isinstance(value, str):
+        return None
+    return value.strip() or None
+
 class ResearcherAgent:
-    def __init__(self):
+    def __init__(
+        self,
+        target_start: datetime = TARGET_START,
+        target_end: datetime = TARGET_END,
+        target_event_count: int = TARGET_EVENT_COUNT
+    ):
         self.events = []
+        self._midway_writer = None
+        
+        # Inclusive date range events must fall in
+        check_target_range(target_start, target_end)
+        self.target_start = target_start
+        self.target_end = target_end
+        
+        # Unique in-range events after which no further queries are sent
+        self.target_event_count = target_event_count
         
         # Validate API keys
         if not os.getenv("OPENAI_API_KEY"):
@@ -24,17 +127,16 @@ class ResearcherAgent:
         if not os.getenv("PERPLEXITY_API_KEY"):
             raise ValueError("PERPLEXITY_API_KEY environment variable is not set")
         
-        # Initialize Perplexity Client
-        self.search_tool = Client()  # Perplexity client automatically uses the API key from environment
+        # Perplexity clients live on the search threads, which are kept for the
+        # agent's lifetime so their clients and connections are reused across runs
+        self.search_pool = ThreadPoolExecutor(max_workers=QUERY_WAVE_SIZE)
         
         # Initialize OpenAI model for event processing
-        self.llm = ChatOpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="gpt-4-turbo-preview"  # Using GPT-4 for better event understanding
-        )
+        self.llm = get_llm("gpt-4o-mini")  # Extraction only restructures search answers into JSON
         
         self.results_dir = "./results"
         os.makedirs(self.results_dir, exist_ok=True)
+        self.search_cache = JsonCache(os.path.join(self.results_dir, ".search_cache.json"), SEARCH_CACHE_TTL)
         self.sample_events = [
             {
                 "title": "AI & Machine Learning Meetup",
@@ -47,26 +149,32 @@ class ResearcherAgent:
         ]
     
     def save_midway(self, events: List[Dict]):
-        """Save intermediate results"""
-        with open(os.path.join(self.results_dir, "midway.json"), "w") as f:
-            json.dump(events, f, indent=2)
+        """Save intermediate results in a background thread"""
+        # Only one writer at a time, so runs never race on the temp file
+        if self._midway_writer is not None:
+            self._midway_writer.join()
+        
+        path = os.path.join(self.results_dir, "midway.json")
+        self._midway_writer = threading.Thread(
+            target=lambda: atomic_write(path, json_dumps(events, indent=True))
+        )
+        self._midway_writer.start()
     
     def _extract_event_details(self, text: str) -> Dict[str, Any]:
         """Extract structured event details from text."""
-        # More comprehensive date patterns
-        date_patterns = [
-            r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}\b',  # May 19, 2025
-            r'\b\d{4}-\d{2}-\d{2}\b',  # 2025-05-19
-            r'\b(?:Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}\b'  # Monday, May 19, 2025
-        ]
-        
         dates = []
-        for pattern in date_patterns:
-            dates.extend(re.findall(pattern, text))
+        times = []
+        for match in _EVENT_DETAILS_RE.finditer(text):
+            if match.group('time') is not None:
+                times.append(match.group())
+            else:
+                dates.append(match.group())
         
-        # Extract time if present
-        time_pattern = r'\b\d{1,2}:\d{2}(?::\d{2})?\s*(?:AM|PM|am|pm)?\b'
-        times = re.findall(time_pattern, text)
+        # Parse the first recognisable date once; ordinals ("May 20th") are dropped first
+        date_dt = next(
+            (parsed for parsed in (parse_event_date(_ORDINAL_RE.sub(r'\1', date)) for date in dates) if parsed),
+            None
+        )
         
         # Try to extract a title (first line or first sentence)
         title = text.split('\n')[0].strip() if text else ""
@@ -75,52 +183,41 @@ class ResearcherAgent:
         
         return {
             "date": dates[0] if dates else None,
+            "date_dt": date_dt,
             "time": times[0] if times else None,
-            "title": title,
-            "raw_text": text
+            "title": title
         }
     
-    def _validate_event(self, event: Dict[str, Any]) -> bool:
-        """Validate if an event matches our criteria."""
+    def _in_target_range(self, event_date: Optional[datetime]) -> bool:
+        """Check if a parsed event date falls within the target week."""
+        return event_date is not None and self.target_start <= event_date <= self.target_end
+    
+    def _validate_event(self, event: Dict[str, Any], event_date: Optional[datetime] = None) -> bool:
+        """Validate if an event matches our criteria, reusing an already parsed date if given."""
         if not event.get("title") or not event.get("date"):
             return False
-            
-        # Check if date is within our target range
-        try:
-            # Try different date formats
-            date_formats = [
-                "%Y-%m-%d",  # 2025-05-19
-                "%B %d, %Y",  # May 19, 2025
-                "%A, %B %d, %Y"  # Monday, May 19, 2025
-            ]
-            
-            event_date = None
-            for date_format in date_formats:
-                try:
-                    event_date = datetime.strptime(event["date"], date_format)
-                    break
-                except ValueError:
-                    continue
-            
-            if not event_date:
-                return False
-                
-            # Target range: May 19-23, 2025
-            target_start = datetime(2025, 5, 19)  # Monday
-            target_end = datetime(2025, 5, 23)    # Friday
-            return target_start <= event_date <= target_end
-        except (ValueError, TypeError):
-            return False
+        if event_date is None:
+            event_date = parse_event_date(event["date"])
+        return self._in_target_range(event_date)
     
-    def _search_events(self, query: str) -> List[Dict[str, Any]]:
-        """Search for events using Perplexity Client."""
+    def _fetch_raw(self, query: str) -> str:
+        """Fetch the raw answer text for a query from Perplexity."""
+        cache_key = hashlib.sha1(query.encode()).hexdigest()
+        if os.getenv("AGIH_CACHE_BUST") != "1":
+            cached_text = self.search_cache.get(cache_key)
+            if cached_text is not None:
+                log_emoji("♻️", f"Using cached search results for: {query[:60]}")
+                return cached_text
+        
         try:
             print("\n🔍 ===== STARTING NEW SEARCH =====")
             print(f"Query: {query}")
             
-            search_results = self.search_tool.search(query)
+            search_results = _get_search_client().search(query)
             
-            # Extract the actual answer text from the Perplexity response
+            # Extract the actual answer text from the Perplexity response,
+            # falling back to the whole response only if there is no final answer
+            text = None
             if isinstance(search_results, dict) and 'text' in search_results:
                 for item in search_results['text']:
                     if isinstance(item, dict) and item.get('step_type') == 'FINAL':
@@ -128,135 +225,261 @@ class ResearcherAgent:
                         if isinstance(content, dict) and 'answer' in content:
                             text = content['answer']
                             break
-                else:
-                    text = str(search_results)
-            else:
+            # Only real answers are cached; an error payload would hide the query for hours
+            cacheable = text is not None
+            if text is None:
                 text = str(search_results)
             
             # Clean up the response
             text = text.replace('\\n', '\n').replace('\\"', '"')
+        except Exception as e:
+            print(f"\n💥 ERROR: {str(e)}")
+            import traceback
+            print(traceback.format_exc())
+            return ""
+        
+        if cacheable:
+            try:
+                self.search_cache.set(cache_key, text)
+            except OSError as e:
+                logger.warning(f"Researcher: Could not write search cache: {str(e)}")
+        return text
+    
+    def _batch_raw_texts(self, raw_texts: List[str]) -> List[List[str]]:
+        """Split raw texts into prompt batches, halving when a single text is too large."""
+        if len(raw_texts) > 1 and any(len(text) // CHARS_PER_TOKEN > MAX_BATCH_TEXT_TOKENS for text in raw_texts):
+            middle = len(raw_texts) // 2
+            return [raw_texts[:middle], raw_texts[middle:]]
+        return [raw_texts]
+    
+    def _parse_events_json(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        """Parse the events array out of the LLM's JSON response, or None if it is not JSON."""
+        start, end = text.find('['), text.rfind(']')
+        if start == -1 or end < start:
+            return None
+        try:
+            parsed = json_loads(text[start:end + 1])
+        except ValueError:
+            return None
+        return parsed if isinstance(parsed, list) else None
+    
+    def _event_from_json(self, item: Any) -> Optional[Dict[str, Any]]:
+        """Build an event from one JSON object returned by the LLM, if it is valid."""
+        if not isinstance(item, dict):
+            return None
+        event_date = parse_event_date(item.get("date"))
+        if not self._in_target_range(event_date):
+            return None
+        event = {
+            "title": _json_str(item.get("title")),
+            "date": event_date.strftime("%Y-%m-%d"),
+            "location": _json_str(item.get("location")) or "San Francisco",
+            "url": _json_str(item.get("url")),
+            "type": _json_str(item.get("type")) or "Conference"
+        }
+        return event if self._validate_event(event, event_date) else None
+    
+    def _stream_clean(self, prompt: str) -> List[Dict[str, Any]]:
+        """Stream the JSON-mode cleanup response, validating each event as soon as its object completes."""
+        decoder = json.JSONDecoder()
+        chunks = []
+        buffer = ""
+        in_array = False
+        decoded = 0
+        events = []
+        
+        for chunk in self.llm.stream(prompt, response_format={"type": "json_object"}):
+            chunks.append(chunk.content)
+            if in_array:
+                buffer += chunk.content
+            else:
+                # Nothing is buffered until the events array opens; the full
+                # text is only joined from the chunk list once at the end
+                start = chunk.content.find('[')
+                if start == -1:
+                    continue
+                buffer = chunk.content[start + 1:]
+                in_array = True
             
-            # Use LLM to clean and structure the events
-            prompt = f"""Given the following text about AI events, extract and format the events into a clean list. 
-            Remove any JSON artifacts, web results, or non-event content. Format each event with ONLY these fields:
-            - Title (clean, no markdown)
-            - Date (in YYYY-MM-DD format)
-            - Location (if available)
-            - URL (MUST be included, if not found in text, search for the event's website)
-            - Type (Conference, Meetup, Workshop, or Hackathon)
-
-            DO NOT include time or description fields.
-            Each event MUST have a URL - if not found in the text, search for the event's official website.
+            # Decode every complete object at the head of the buffer
+            while True:
+                buffer = buffer.lstrip(' \t\r\n,')
+                if not buffer.startswith('{'):
+                    break
+                try:
+                    item, end = decoder.raw_decode(buffer)
+                except json.JSONDecodeError:
+                    break  # Object not complete yet, wait for more chunks
+                buffer = buffer[end:]
+                decoded += 1
+                event = self._event_from_json(item)
+                if event:
+                    events.append(event)
+        
+        cleaned_text = "".join(chunks)
+        if not decoded and self._parse_events_json(cleaned_text) is None:
+            # Fall back to the text heuristics if the model didn't return JSON
+            return self._parse_event_blocks(cleaned_text)
+        return events
+    
+    def _clean_all_events(self, raw_texts: List[str]) -> List[Dict[str, Any]]:
+        """Clean and structure the raw texts of every query with one LLM call per batch."""
+        raw_texts = [text for text in raw_texts if text.strip()]
+        if not raw_texts:
+            return []
+        
+        events = []
+        for batch in self._batch_raw_texts(raw_texts):
+            try:
+                results = "\n".join(
+                    f"---QUERY {i}---\n{text}" for i, text in enumerate(batch, start=1)
+                )
+                
+                # Use LLM to clean and structure the events of all queries at once
+                prompt = f"""Given the following search results about AI events, extract and format the events into a clean list.
+                Each search result starts with a ---QUERY N--- delimiter.
+                Remove any JSON artifacts, web results, or non-event content.
+                Return ONLY a JSON object of the form {{"events": [...]}}. Each event is an object with ONLY these fields:
+                - "title": clean title, no markdown
+                - "date": in YYYY-MM-DD format
+                - "location": venue or city, if available
+                - "url": MUST be included, if not found in text, use the event's official website
+                - "type": one of Conference, Meetup, Workshop, or Hackathon
 
-            Text to process:
-            {text}
+                DO NOT include time or description fields.
+                If several results describe the same event (same URL), include it only once.
 
-            Return the events in a clean, structured format."""
+                Search results:
+                {results}"""
 
-            response = self.llm.invoke(prompt)
-            cleaned_text = response.content
-            
-            # Split into potential events
-            event_blocks = []
-            current_block = []
+                events.extend(self._stream_clean(prompt))
+            except Exception as e:
+                print(f"\n💥 ERROR: {str(e)}")
+                import traceback
+                print(traceback.format_exc())
+        
+        return events
+    
+    def _parse_event_blocks(self, cleaned_text: str) -> List[Dict[str, Any]]:
+        """Extract events from free-form LLM output by splitting it into blocks."""
+        events = []
+        for block in _BLOCK_SPLIT_RE.split(cleaned_text):
+            block = block.strip()
+            if not block:
+                continue
             
-            for line in cleaned_text.split('\n'):
-                line = line.strip()
-                if not line:
-                    if current_block:
-                        event_blocks.append('\n'.join(current_block))
-                        current_block = []
-                elif line.startswith(('###', '- **', '* **', '**')):
-                    if current_block:
-                        event_blocks.append('\n'.join(current_block))
-                        current_block = []
-                    current_block.append(line)
-                else:
-                    current_block.append(line)
+            # Skip summary blocks and JSON artifacts
+            if _SKIP_BLOCK_RE.search(block):
+                continue
             
-            if current_block:
-                event_blocks.append('\n'.join(current_block))
+            # Extract event details
+            event_details = self._extract_event_details(block)
             
-            events = []
-            for block in event_blocks:
-                if not block.strip():
-                    continue
+            # Drop out-of-range events before doing any more work on them
+            event_date = event_details["date_dt"]
+            if self._in_target_range(event_date):
+                # Clean up the title
+                title = event_details["title"]
                 
-                # Skip summary blocks and JSON artifacts
-                if any(skip in block.lower() for skip in ['summary', 'in summary', 'overview', 'note:', 'while there are']):
-                    continue
-                if block.startswith('{') or block.startswith('"answer":'):
-                    continue
+                # Remove markdown and formatting
+                title = _TITLE_STRIP_RE.sub('', title).strip()
                 
-                # Extract event details
-                event_details = self._extract_event_details(block)
+                # Determine event type
+                words = set(_WORD_RE.findall(block.lower()))
+                event_type = next(
+                    (name for name, keywords in _EVENT_TYPE_KEYWORDS if words & keywords),
+                    "Conference"
+                )
                 
-                if event_details["date"]:
-                    # Clean up the title
-                    title = event_details["title"]
-                    
-                    # Remove markdown and formatting
-                    title = re.sub(r'^\*\*|\*\*$', '', title)  # Remove markdown bold
-                    title = re.sub(r'^\[.*?\]', '', title)  # Remove [link] prefix
-                    title = re.sub(r'\(pplx://.*?\)', '', title)  # Remove Perplexity links
-                    title = re.sub(r'^###\s*', '', title)  # Remove markdown headers
-                    title = re.sub(r'^\s*[-•*]\s*', '', title)  # Remove bullet points
-                    title = re.sub(r'^"|"$', '', title)  # Remove quotes
-                    title = re.sub(r',\s*$', '', title)  # Remove trailing commas
-                    title = title.strip()
-                    
-                    # Determine event type
-                    event_type = "Conference"
-                    if any(word in block.lower() for word in ['meetup', 'networking']):
-                        event_type = "Meetup"
-                    elif any(word in block.lower() for word in ['workshop', 'training']):
-                        event_type = "Workshop"
-                    elif any(word in block.lower() for word in ['hackathon']):
-                        event_type = "Hackathon"
-                    
-                    # Extract URL from the block
-                    url = None
-                    url_pattern = r'https?://[^\s<>"]+|www\.[^\s<>"]+'
-                    urls = re.findall(url_pattern, block)
-                    if urls:
-                        url = urls[0]
-                    
-                    event = {
-                        "title": title,
-                        "date": event_details["date"],
-                        "location": "San Francisco",
-                        "url": url,
-                        "type": event_type
-                    }
-                    
-                    if self._validate_event(event):
-                        events.append(event)
-            
-            return events
-        except Exception as e:
-            print(f"\n💥 ERROR: {str(e)}")
-            import traceback
-            print(traceback.format_exc())
-            return []
+                # Extract URL from the block
+                url_match = _URL_RE.search(block)
+                url = url_match.group() if url_match else None
+                
+                event = {
+                    "title": title,
+                    "date": event_date.strftime("%Y-%m-%d"),
+                    "location": "San Francisco",
+                    "url": url,
+                    "type": event_type
+                }
+                
+                if self._validate_event(event, event_date):
+                    events.append(event)
+        
+        return events
+    
+    def _dedupe_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop events with the same URL, or the same title and date if they have none, keeping the first one found."""
+        seen = set()
+        unique_events = []
+        for event in events:
+            key = event_key(event)
+            if key not in seen:
+                seen.add(key)
+                unique_events.append(event)
+        return unique_events
+    
+    def _search_queries(self) -> List[str]:
+        """Build the search queries for the target date range."""
+        start, end = self.target_start, self.target_end
+        if start.month == end.month:
+            days = f"{start:%B} {start.day}-{end.day}"  # May 19-23
+            month = f"{start:%B %Y}"  # May 2025
+        else:
+            days = f"{start:%B} {start.day}-{end:%B} {end.day}"  # May 29-June 2
+            month = f"{start:%B %Y} and {end:%B %Y}"  # May 2025 and June 2025
+        
+        return [
+            f"List all AI events happening in San Francisco from {start:%B} {start.day} to {end:%B} {end.day}, {end.year}, including meetups, workshops, hackathons, and conferences. Include links and event details, check the Generative AI SF Events Calendar and Cerebral Valley Site and the following list here: https://docs.google.com/spreadsheets/d/1P6ut7vL-gXKbeDeh3nuPqBjoCupjIt87Sw7TnhumBSU/edit?gid=1781893986#gid=1781893986",
+            f"AI events San Francisco {days} {end.year}",
+            "Artificial Intelligence meetups San Francisco next week",
+            f"AI conferences San Francisco {month}",
+            f"Machine Learning events San Francisco {days}",
+            f"AI events Cerebral Valley San Francisco {days} {end.year}",
+            f"Cerebral Valley AI meetups San Francisco {month}"
+        ]
     
     def scrape_events(self) -> List[Dict]:
         log_emoji("🔍", "Starting event search...")
         
         # List of search queries to try
-        search_queries = [
-            "List all AI events happening in San Francisco from May 19 to May 23, 2025, including meetups, workshops, hackathons, and conferences. Include links and event details, check the Generative AI SF Events Calendar and Cerebral Valley Site and the following list here: https://docs.google.com/spreadsheets/d/1P6ut7vL-gXKbeDeh3nuPqBjoCupjIt87Sw7TnhumBSU/edit?gid=1781893986#gid=1781893986",
-            "AI events San Francisco May 19-23 2025",
-            "Artificial Intelligence meetups San Francisco next week",
-            "AI conferences San Francisco May 2025",
-            "Machine Learning events San Francisco May 19-23",
-            "AI events Cerebral Valley San Francisco May 19-23 2025",
-            "Cerebral Valley AI meetups San Francisco May 2025"
-        ]
+        search_queries = self._search_queries()
         
-        all_events = []
+        # Don't issue the same query twice
+        seen_queries = set()
+        unique_queries = []
         for query in search_queries:
-            events = self._search_events(query)
-            all_events.extend(events)
+            normalized = " ".join(query.lower().split())
+            if normalized not in seen_queries:
+                seen_queries.add(normalized)
+                unique_queries.append(query)
+        search_queries = unique_queries
+        
+        # Searches are I/O-bound, so fetch each wave concurrently and clean it
+        # in a single LLM call; texts are kept in query order so downstream
+        # "first one wins" deduplication stays stable
+        all_events = []
+        seen_texts = set()
+        for wave_start in range(0, len(search_queries), QUERY_WAVE_SIZE):
+            wave = search_queries[wave_start:wave_start + QUERY_WAVE_SIZE]
+            raw_texts = []
+            for text in self.search_pool.map(self._fetch_raw, wave):
+                # Overlapping queries often return the very same answer
+                text_hash = hash(text)
+                if text_hash not in seen_texts:
+                    seen_texts.add(text_hash)
+                    raw_texts.append(text)
+            all_events.extend(self._clean_all_events(raw_texts))
+            
+            # Stop early once the remaining queries are unlikely to be needed
+            unique_count = len(self._dedupe_events(all_events))
+            if unique_count >= self.target_event_count:
+                remaining = len(search_queries) - wave_start - len(wave)
+                if remaining:
+                    log_emoji("⏩", f"Found {unique_count} unique events, skipping {remaining} remaining queries")
+                break
+        
+        all_events = self._dedupe_events(all_events)
         
         # If no events found, use sample data
         if not all_events:
@@ -265,17 +488,17 @@ class ResearcherAgent:
         
         # Save intermediate results
         self.save_midway(all_events)
-        log_emoji("💾", "Saved intermediate results to midway.json")
+        log_emoji("💾", "Saving intermediate results to midway.json")
         
         log_emoji("✅", f"Found {len(all_events)} events")
         return all_events
     
-    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """Run the researcher agent."""
         logger.info("🎯 Researcher agent activated")
         
-        # Search for events
-        events = self.scrape_events()
+        # Searching fans out over the agent's own thread pool; run it off the event loop
+        events = await asyncio.to_thread(self.scrape_events)
         
         # Update state
         state["events"] = events
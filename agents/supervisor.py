@@ -1,26 +1,36 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from langchain_core.messages import HumanMessage, AIMessage
-from langchain_openai import ChatOpenAI
-from .utils import log_emoji
+from .utils import log_emoji, check_target_range, get_llm, event_key, parse_event_date, TARGET_START, TARGET_END
+import asyncio
 import logging
 import os
 import json
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Fields every researched event must have, and the categories it may have
+REQUIRED_EVENT_FIELDS = ("title", "date", "location", "url", "type")
+EVENT_TYPES = {"Conference", "Meetup", "Workshop", "Hackathon"}
+
+# Titles are cut to this length in the review prompt
+MAX_PROMPT_TITLE_CHARS = 80
+
 class SupervisorAgent:
-    def __init__(self):
+    def __init__(self, target_start: datetime = TARGET_START, target_end: datetime = TARGET_END):
         self.state = {"events": [], "status": "initialized"}
         
+        # Inclusive date range events must fall in
+        check_target_range(target_start, target_end)
+        self.target_start = target_start
+        self.target_end = target_end
+        
         # Validate OpenAI API key
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("OPENAI_API_KEY environment variable is not set")
         
         # Initialize OpenAI model for supervision
-        self.llm = ChatOpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="gpt-4-turbo-preview"  # Using GPT-4 for better supervision
-        )
+        self.llm = get_llm("gpt-4-turbo-preview")  # Using GPT-4 for better supervision
     
     def __call__(self, state: Dict[str, Any]) -> Dict[str, Any]:
         messages = state.get("messages", [])
@@ -61,51 +71,101 @@ class SupervisorAgent:
             "next": "end"
         }
 
-    def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """Run the supervisor agent."""
+    def _render_events(self, events: List[Dict[str, Any]]) -> str:
+        """Render events as compact numbered lines for the review prompt."""
+        lines = []
+        for i, event in enumerate(events, 1):
+            fields = [str(event.get(field) or "?") for field in REQUIRED_EVENT_FIELDS]
+            fields[0] = fields[0][:MAX_PROMPT_TITLE_CHARS]
+            lines.append(f"{i}. {' | '.join(fields)}")
+        return "\n".join(lines)
+    
+    def _find_event_issues(self, events: List[Dict[str, Any]]) -> List[str]:
+        """Run the review checks that need no judgement, describing each problem found."""
+        if not events:
+            return ["no events found"]
+        
+        issues = []
+        missing_fields = [e for e in events if not all(e.get(field) for field in REQUIRED_EVENT_FIELDS)]
+        if missing_fields:
+            issues.append(f"{len(missing_fields)} events missing required fields")
+        
+        out_of_range = [
+            e for e in events
+            if not (date := parse_event_date(e.get("date"))) or not self.target_start <= date <= self.target_end
+        ]
+        if out_of_range:
+            issues.append(f"{len(out_of_range)} events outside the target dates")
+        
+        uncategorized = [e for e in events if e.get("type") not in EVENT_TYPES]
+        if uncategorized:
+            issues.append(f"{len(uncategorized)} events with an unknown category")
+        
+        keys = [event_key(e) for e in events]
+        duplicates = len(keys) - len(set(keys))
+        if duplicates:
+            issues.append(f"{duplicates} duplicate events")
+        
+        return issues
+    
+    async def run(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the supervisor agent, returning its review as a partial state update."""
         logger.info("🧑‍💼 Supervisor: Reviewing events")
         
         # Get events from state
         events = state.get("events", [])
         
-        # Use LLM to review events and determine next steps
-        prompt = f"""Review these AI events and determine if they are properly formatted and complete.
-        Events to review:
-        {json.dumps(events, indent=2)}
-        
-        Consider:
-        1. Are all required fields present (title, date, location, description)?
-        2. Are the dates within the target range (May 19-23, 2025)?
-        3. Are the events properly categorized (Conference, Meetup, Workshop, Hackathon)?
-        4. Are there any duplicates or invalid entries?
-        
-        Return a JSON object in this exact format:
-        {{
-            "status": "ready" or "needs_review",
-            "message": "A brief summary of the review",
-            "next_step": "reporter" or "researcher"
-        }}
-
-        Make sure to return ONLY the JSON object, with no additional text or explanation."""
-
-        response = self.llm.invoke(prompt)
-        try:
-            review = json.loads(response.content)
-        except json.JSONDecodeError:
-            # Fallback if LLM doesn't return valid JSON
+        # Structural checks are cheap in Python; only ask the LLM when they find problems
+        issues = self._find_event_issues(events)
+        if not issues:
             review = {
-                "status": "needs_review",
-                "message": "Error parsing LLM response, defaulting to review",
-                "next_step": "researcher"
+                "status": "ready",
+                "message": f"{len(events)} events validated",
+                "next_step": "reporter"
             }
+        else:
+            logger.info(f"🧑‍💼 Supervisor: Escalating to LLM review: {'; '.join(issues)}")
+            
+            # Use LLM to review events and determine next steps
+            prompt = f"""Review these AI events and determine if they are properly formatted and complete.
+            Events to review ({" | ".join(REQUIRED_EVENT_FIELDS)}):
+            {self._render_events(events)}
         
-        # Update state based on LLM review
-        state["status"] = review["status"]
-        state["next"] = review["next_step"]
-        state["review_message"] = review["message"]
+            Consider:
+            1. Are all required fields present ({", ".join(REQUIRED_EVENT_FIELDS)})?
+            2. Are the dates within the target range ({self.target_start:%B %d} - {self.target_end:%B %d, %Y})?
+            3. Are the events properly categorized (Conference, Meetup, Workshop, Hackathon)?
+            4. Are there any duplicates or invalid entries?
+        
+            Return a JSON object in this exact format:
+            {{
+                "status": "ready" or "needs_review",
+                "message": "A brief summary of the review",
+                "next_step": "reporter" or "researcher"
+            }}
+
+            Make sure to return ONLY the JSON object, with no additional text or explanation."""
+
+            # JSON mode makes the API return a parseable object instead of prose; the
+            # sync call runs off the loop, as async connections die with each run's loop
+            response = await asyncio.to_thread(self.llm.invoke, prompt, response_format={"type": "json_object"})
+            try:
+                review = json.loads(response.content)
+            except json.JSONDecodeError:
+                # Fallback if the response was cut off before the object closed
+                review = {
+                    "status": "needs_review",
+                    "message": "Error parsing LLM response, defaulting to review",
+                    "next_step": "researcher"
+                }
         
         # Log the review
         logger.info(f"📊 Supervisor: {review['message']}")
         logger.info(f"📊 Supervisor: Reviewed {len(events)} events")
         
-        return state 
\ No newline at end of file
+        # Only return the keys set here; the reporter updates state in the same step
+        return {
+            "status": review["status"],
+            "next": review["next_step"],
+            "review_message": review["message"]
+        } 
\ No newline at end of file
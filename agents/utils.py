@@ -1,6 +1,72 @@
 """
 Shared utilities for the agents package
 """
+import atexit
+import importlib.util
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
+
+# Heavy client libraries are imported on first use to keep start-up fast
+if TYPE_CHECKING:
+    import httpx
+    from langchain_openai import ChatOpenAI
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Large enough to hand each output file to the OS in a single write
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Keep-alive pool shared by every OpenAI call in the process
+HTTP_TIMEOUT = 60.0
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 8
+HTTP_MAX_CONNECTIONS = 16
+
+# Stored event dates are ISO, which go through the C-level fromisoformat
+ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")  # 2025-05-19
+
+# Other date shapes found in search text, each dispatched straight to the strptime
+# formats it can take; month and weekday names may be full or abbreviated
+EVENT_DATE_FORMATS = [
+    (re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$"), ("%Y-%m-%d",)),  # 2025-5-19, not zero-padded
+    (re.compile(r"^[A-Za-z]+\s+\d{1,2},\s*\d{4}$"), ("%B %d, %Y", "%b %d, %Y")),  # May 19, 2025 / Jun 30, 2025
+    (re.compile(r"^[A-Za-z]+,\s+[A-Za-z]+\s+\d{1,2},\s*\d{4}$"), (
+        "%A, %B %d, %Y", "%A, %b %d, %Y", "%a, %B %d, %Y", "%a, %b %d, %Y"
+    ))  # Monday, May 19, 2025 / Tue, Jul 1, 2025
+]
+# "Sept" is a common abbreviation strptime's %b doesn't know
+SEPT_RE = re.compile(r"\bSept\b", re.IGNORECASE)
+
+# Expected format: "Monday, May 19, 2025"
+DISPLAY_DATE_RE = re.compile(r"^[A-Za-z]+,\s+[A-Za-z]+\s+\d{1,2},\s+\d{4}$")
+
+# Week the events are gathered for
+TARGET_START = datetime(2025, 5, 19)  # Monday
+TARGET_END = datetime(2025, 5, 23)    # Friday
+
+def check_target_range(start: datetime, end: datetime):
+    """
+    Check a target date range fits the weekly Monday-Friday report
+    
+    Args:
+        start (datetime): The first day of the range
+        end (datetime): The last day of the range
+        
+    Raises:
+        ValueError: If the range runs backwards, touches a weekend or spans two weeks
+    """
+    if start > end or end.weekday() > 4 or (end - start).days != end.weekday() - start.weekday():
+        raise ValueError(
+            f"Target range {start:%Y-%m-%d} to {end:%Y-%m-%d} must fall within a single Monday-Friday week"
+        )
 
 def log_emoji(emoji: str, message: str):
     """
@@ -12,6 +78,170 @@ def log_emoji(emoji: str, message: str):
     """
     print(f"{emoji} {message}")
 
+@lru_cache(maxsize=None)
+def get_http_client() -> "httpx.Client":
+    """
+    Get the process-wide HTTP client used for OpenAI requests
+    
+    HTTP/2 is only enabled when the optional h2 package is installed.
+    The client is closed when the interpreter exits.
+    
+    Returns:
+        httpx.Client: The shared HTTP client
+    """
+    import httpx
+    
+    client = httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=HTTP_TIMEOUT,
+        limits=httpx.Limits(
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=HTTP_MAX_CONNECTIONS
+        )
+    )
+    atexit.register(client.close)
+    return client
+
+@lru_cache(maxsize=None)
+def get_llm(model: str = "gpt-4o-mini") -> "ChatOpenAI":
+    """
+    Get the process-wide OpenAI chat model for a model name
+    
+    The model is built once and shared by every agent, and all models
+    send their requests through the shared HTTP client so connections
+    stay warm across invocations.
+    
+    Args:
+        model (str): The OpenAI model to use
+        
+    Returns:
+        ChatOpenAI: The shared chat model
+    """
+    from langchain_openai import ChatOpenAI
+    
+    return ChatOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model=model,
+        temperature=0,
+        http_client=get_http_client()
+    )
+
+def atomic_write(path: str, content: str):
+    """
+    Write content to a file atomically through a temporary file
+    
+    Args:
+        path (str): The file to write
+        content (str): The text to write
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+def json_dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    Serialize an object to JSON, using orjson when it is installed
+    
+    Args:
+        obj (Any): The object to serialize
+        indent (bool): Pretty-print with a two space indent instead of compact output
+        sort_keys (bool): Sort dictionary keys
+        
+    Returns:
+        str: The JSON text
+    """
+    if orjson is not None:
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, option=option).decode()
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys)
+
+def json_loads(text: str) -> Any:
+    """
+    Parse JSON text, using orjson when it is installed
+    
+    Args:
+        text (str): The JSON text to parse
+        
+    Returns:
+        Any: The parsed object
+        
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+class JsonCache:
+    """
+    Small on-disk JSON cache whose entries expire after a TTL
+    
+    Safe to share between threads; each operation re-reads the file so
+    separate runs see each other's entries.
+    """
+    
+    def __init__(self, path: str, ttl: float):
+        """
+        Args:
+            path (str): The JSON file backing the cache
+            ttl (float): Seconds an entry stays valid
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+    
+    def _load(self) -> dict:
+        """Load the cache file, or an empty cache if it is missing or corrupt."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                cache = json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+    
+    def _is_fresh(self, entry: Any, now: float) -> bool:
+        """Check that an entry is well-formed and has not expired."""
+        if not isinstance(entry, dict):
+            return False
+        timestamp = entry.get("timestamp")
+        return isinstance(timestamp, (int, float)) and now - timestamp <= self.ttl
+    
+    def get(self, key: str) -> Any:
+        """
+        Get a cached value
+        
+        Args:
+            key (str): The cache key
+            
+        Returns:
+            Any: The cached value, or None if it is missing or expired
+        """
+        with self._lock:
+            entry = self._load().get(key)
+        if not self._is_fresh(entry, time.time()):
+            return None
+        return entry.get("value")
+    
+    def set(self, key: str, value: Any):
+        """
+        Store a value, pruning expired entries
+        
+        Args:
+            key (str): The cache key
+            value (Any): The JSON-serializable value to store
+        """
+        with self._lock:
+            now = time.time()
+            cache = {
+                k: v for k, v in self._load().items()
+                if self._is_fresh(v, now)
+            }
+            cache[key] = {"value": value, "timestamp": now}
+            atomic_write(self.path, json_dumps(cache))
+
 def validate_event(event: dict) -> bool:
     """
     Validate an event dictionary has all required fields
@@ -25,6 +255,51 @@ def validate_event(event: dict) -> bool:
     required_fields = ["Title", "Date", "URL", "Location", "Type"]
     return all(field in event and event[field] for field in required_fields)
 
+def event_key(event: dict) -> Any:
+    """
+    Get the key that identifies an event across search results
+    
+    Args:
+        event (dict): The event to identify
+        
+    Returns:
+        Any: The event's URL, or its title and date if it has no URL
+    """
+    return event.get("url") or (event.get("title"), event.get("date"))
+
+def parse_event_date(date_str: str) -> Optional[datetime]:
+    """
+    Parse an event date in any of the formats the researcher produces
+    
+    Args:
+        date_str (str): The date string to parse
+        
+    Returns:
+        datetime: The parsed date, or None if the format is not recognised
+    """
+    if not isinstance(date_str, str):
+        return None
+    return _parse_event_date_str(date_str)
+
+@lru_cache(maxsize=4096)
+def _parse_event_date_str(date_str: str) -> Optional[datetime]:
+    """Parse a date string, cached since overlapping searches repeat the same dates."""
+    if ISO_DATE_RE.match(date_str):
+        try:
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            return None
+    date_str = SEPT_RE.sub("Sep", date_str)
+    for shape, date_formats in EVENT_DATE_FORMATS:
+        if shape.match(date_str):
+            for date_format in date_formats:
+                try:
+                    return datetime.strptime(date_str, date_format)
+                except ValueError:
+                    continue
+            return None
+    return None
+
 def parse_date(date_str: str) -> bool:
     """
     Validate a date string is in the correct format
@@ -35,10 +310,7 @@ def parse_date(date_str: str) -> bool:
     Returns:
         bool: True if valid, False otherwise
     """
-    import re
     try:
-        # Expected format: "Monday, May 19, 2025"
-        date_pattern = r"^[A-Za-z]+,\s+[A-Za-z]+\s+\d{1,2},\s+\d{4}$"
-        return bool(re.match(date_pattern, date_str))
-    except:
+        return bool(DISPLAY_DATE_RE.match(date_str))
+    except TypeError:
         return False 
\ No newline at end of file
@@ -1,9 +1,11 @@
+import asyncio
+from functools import lru_cache
 from typing import Dict, List, Any, Annotated, TypedDict
 from langgraph.graph import StateGraph, END
 from agents.researcher import ResearcherAgent
 from agents.reporter import ReporterAgent
 from agents.supervisor import SupervisorAgent
-import json
+from agents.utils import atomic_write, json_dumps
 import logging
 from dotenv import load_dotenv
 import os
@@ -48,11 +50,14 @@ class AgentState(TypedDict):
     events: List[Dict[str, Any]]
     status: str
 
+@lru_cache(maxsize=None)
+def get_agents():
+    """Build the agents once, so repeated workflows reuse their clients and pools."""
+    return ResearcherAgent(), ReporterAgent(), SupervisorAgent()
+
 def create_workflow() -> StateGraph:
-    # Initialize agents
-    researcher = ResearcherAgent()
-    reporter = ReporterAgent()
-    supervisor = SupervisorAgent()
+    # Wire the shared agents into a fresh graph
+    researcher, reporter, supervisor = get_agents()
     
     # Create workflow
     workflow = StateGraph(AgentState)
@@ -62,9 +67,11 @@ def create_workflow() -> StateGraph:
     workflow.add_node("reporter", reporter.run)
     workflow.add_node("supervisor", supervisor.run)
     
-    # Define edges
+    # Define edges; the reporter and the supervisor both only need the
+    # researched events, so they run side by side in the same step
     workflow.add_edge("researcher", "reporter")
-    workflow.add_edge("reporter", "supervisor")
+    workflow.add_edge("researcher", "supervisor")
+    workflow.add_edge("reporter", END)
     workflow.add_edge("supervisor", END)
     
     # Set entry point
@@ -72,15 +79,17 @@ def create_workflow() -> StateGraph:
     
     return workflow
 
-def run():
+@lru_cache(maxsize=None)
+def get_app():
+    """Compile the workflow once and reuse it for every run."""
+    return create_workflow().compile()
+
+async def run():
     # Validate API keys first
     validate_api_keys()
     
-    # Create workflow
-    app = create_workflow()
-    
-    # Compile workflow
-    app = app.compile()
+    # Get the compiled workflow
+    app = get_app()
     
     # Initialize state
     initial_state = {
@@ -91,12 +100,11 @@ def run():
     
     # Run workflow
     logger.info("🎯 Supervisor: Starting workflow")
-    result = app.invoke(initial_state)
+    result = await app.ainvoke(initial_state)
     
-    # Save final results
-    with open("final_results.json", "w") as f:
-        json.dump(result, f, indent=2)
+    # Save final results atomically, without blocking the event loop
+    await asyncio.to_thread(atomic_write, "final_results.json", json_dumps(result, indent=True))
     logger.info("💾 Final results saved to final_results.json")
 
 if __name__ == "__main__":
-    run() 
\ No newline at end of file
+    asyncio.run(run()) 
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Shared fixtures for the agents test suite
+"""
+import pytest
+
+from agents.researcher import ResearcherAgent
+
+
+@pytest.fixture
+def agent_env(monkeypatch, tmp_path):
+    """Fake API keys, with the working directory (and so results/) in a temp dir."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("PERPLEXITY_API_KEY", "test-key")
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def researcher(agent_env):
+    """A researcher for the default target week."""
+    agent = ResearcherAgent()
+    yield agent
+    agent.search_pool.shutdown()
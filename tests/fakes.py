@@ -0,0 +1,44 @@
+"""
+Test doubles for the chat model and the Perplexity client
+"""
+import asyncio
+from types import SimpleNamespace
+
+
+class FakeLLM:
+    """Chat model double that replays a canned response, streaming it in fixed-size chunks."""
+
+    def __init__(self, response: str, chunk_size: int = 7):
+        self.response = response
+        self.chunk_size = chunk_size
+        self.calls = []
+        self.loop = None
+
+    def invoke(self, prompt: str, **kwargs):
+        self.calls.append((prompt, kwargs))
+        return SimpleNamespace(content=self.response)
+
+    async def ainvoke(self, prompt: str, **kwargs):
+        # Like a shared async HTTP client, stay bound to the first caller's event loop
+        loop = asyncio.get_running_loop()
+        if self.loop not in (None, loop):
+            raise RuntimeError("Event loop is closed")
+        self.loop = loop
+        return self.invoke(prompt, **kwargs)
+
+    def stream(self, prompt: str, **kwargs):
+        self.calls.append((prompt, kwargs))
+        for start in range(0, len(self.response), self.chunk_size):
+            yield SimpleNamespace(content=self.response[start:start + self.chunk_size])
+
+
+class FakeSearchClient:
+    """Perplexity client double that returns a canned search response."""
+
+    def __init__(self, response):
+        self.response = response
+        self.queries = []
+
+    def search(self, query):
+        self.queries.append(query)
+        return self.response
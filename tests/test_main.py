@@ -0,0 +1,48 @@
+"""
+Tests for running the whole workflow
+"""
+import asyncio
+import json
+
+import pytest
+
+import main
+from fakes import FakeLLM, FakeSearchClient
+
+SEARCH_RESPONSE = {"text": [{"step_type": "FINAL", "content": {"answer": "AI Builders Meetup, May 20, 2025"}}]}
+
+# The unknown category makes the supervisor escalate to its LLM review
+RESEARCH_RESPONSE = json.dumps({"events": [
+    {"title": "AI Builders Meetup", "date": "2025-05-20", "location": "SoMa", "url": "https://lu.ma/ai-builders", "type": "Party"}
+]})
+
+REVIEW_RESPONSE = json.dumps({"status": "ready", "message": "1 event reviewed", "next_step": "reporter"})
+
+
+@pytest.fixture
+def agents(agent_env, monkeypatch):
+    """The workflow's shared agents, talking to fake models and search."""
+    main.get_agents.cache_clear()
+    main.get_app.cache_clear()
+    monkeypatch.setattr("agents.researcher._get_search_client", lambda: FakeSearchClient(SEARCH_RESPONSE))
+    researcher, reporter, supervisor = main.get_agents()
+    researcher.llm = FakeLLM(RESEARCH_RESPONSE)
+    reporter.llm = FakeLLM("**[TUESDAY]**\nAI Builders Meetup")
+    supervisor.llm = FakeLLM(REVIEW_RESPONSE)
+    yield researcher, reporter, supervisor
+    researcher.search_pool.shutdown()
+    main.get_agents.cache_clear()
+    main.get_app.cache_clear()
+
+
+def test_workflow_runs_again_on_a_new_event_loop(agents):
+    _, _, supervisor = agents
+
+    for _ in range(2):
+        asyncio.run(main.run())
+
+        with open("final_results.json", encoding="utf-8") as f:
+            result = json.load(f)
+        assert result["status"] == "ready"
+        assert result["formatted_events"].endswith("**[TUESDAY]**\nAI Builders Meetup")
+    assert len(supervisor.llm.calls) == 2
@@ -0,0 +1,53 @@
+"""
+Tests for the reporter's formatting
+"""
+import pytest
+
+from agents.reporter import ReporterAgent
+from fakes import FakeLLM
+
+EVENTS = [
+    {"title": "AI Builders Meetup", "date": "2025-05-20", "location": "SoMa", "url": "https://lu.ma/ai-builders", "type": "Meetup"},
+    {"title": "LLM Hackathon", "date": "2025-05-21", "location": "Mission", "url": "https://example.com/hack", "type": "Hackathon"}
+]
+
+
+@pytest.fixture
+def reporter(agent_env):
+    agent = ReporterAgent()
+    agent.llm = FakeLLM("**[TUESDAY]**\nAI Builders Meetup")
+    return agent
+
+
+def test_format_events_calls_the_llm_on_a_cache_miss(reporter):
+    markdown = reporter.format_events(EVENTS)
+
+    assert len(reporter.llm.calls) == 1
+    assert markdown.startswith("**==================[ WEEK ")
+    assert markdown.endswith("EVENTS ]==================**\n\n**[TUESDAY]**\nAI Builders Meetup")
+
+
+def test_format_events_reuses_the_cached_response_for_the_same_events(reporter):
+    first = reporter.format_events(EVENTS)
+    second = reporter.format_events([dict(event, time="18:00") for event in EVENTS])
+
+    assert second == first
+    assert len(reporter.llm.calls) == 1
+
+
+def test_format_events_misses_the_cache_when_events_change(reporter):
+    reporter.format_events(EVENTS)
+    reporter.format_events(EVENTS[:1])
+
+    assert len(reporter.llm.calls) == 2
+
+
+def test_dedupe_events_matches_on_url_before_title(reporter):
+    events = [
+        {"title": "AI Builders Meetup", "date": "2025-05-20", "url": "https://lu.ma/ai-builders"},
+        {"title": "AI Builders Meetup SF", "date": "2025-05-20", "url": "https://lu.ma/ai-builders"},
+        {"title": "LLM Hackathon", "date": "2025-05-21", "url": None},
+        {"title": "LLM Hackathon", "date": "2025-05-21", "url": None}
+    ]
+
+    assert reporter._dedupe_events(events) == [events[0], events[2]]
@@ -0,0 +1,247 @@
+"""
+Tests for the researcher's event parsing
+"""
+import hashlib
+import json
+from datetime import datetime
+
+import pytest
+
+from agents.researcher import QUERY_WAVE_SIZE, ResearcherAgent, _BLOCK_SPLIT_RE, _TITLE_STRIP_RE
+from fakes import FakeLLM, FakeSearchClient
+
+
+def split_blocks(text):
+    return [block.strip() for block in _BLOCK_SPLIT_RE.split(text) if block.strip()]
+
+
+CLEANUP_RESPONSE = json.dumps({
+    "events": [
+        {"title": "AI Builders Meetup", "date": "2025-05-20", "location": "SoMa", "url": "https://lu.ma/ai-builders", "type": "Meetup"},
+        {"title": "Too Late Summit", "date": "2025-05-27", "location": "SF", "url": "https://example.com/late", "type": "Conference"},
+        {"title": "LLM Hackathon", "date": "May 21, 2025", "url": "https://example.com/hack", "type": "Hackathon"}
+    ]
+}, indent=2)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, len(CLEANUP_RESPONSE)])
+def test_stream_clean_decodes_events_across_chunk_boundaries(researcher, chunk_size):
+    researcher.llm = FakeLLM(CLEANUP_RESPONSE, chunk_size)
+
+    events = researcher._stream_clean("prompt")
+
+    assert events == [
+        {"title": "AI Builders Meetup", "date": "2025-05-20", "location": "SoMa", "url": "https://lu.ma/ai-builders", "type": "Meetup"},
+        {"title": "LLM Hackathon", "date": "2025-05-21", "location": "San Francisco", "url": "https://example.com/hack", "type": "Hackathon"}
+    ]
+
+
+def test_stream_clean_requests_json_mode(researcher):
+    researcher.llm = FakeLLM(CLEANUP_RESPONSE)
+
+    researcher._stream_clean("prompt")
+
+    assert researcher.llm.calls == [("prompt", {"response_format": {"type": "json_object"}})]
+
+
+def test_stream_clean_with_no_events_does_not_fall_back(researcher):
+    researcher.llm = FakeLLM('{"events": []}')
+
+    assert researcher._stream_clean("prompt") == []
+
+
+@pytest.mark.parametrize("raw_title", [
+    "**AI Builders Meetup**",
+    "[1] AI Builders Meetup",
+    "### AI Builders Meetup",
+    "- AI Builders Meetup",
+    "* AI Builders Meetup",
+    "• AI Builders Meetup",
+    '"AI Builders Meetup"',
+    "AI Builders Meetup,",
+    "AI Builders Meetup (pplx://source/1)"
+])
+def test_title_strip_removes_single_markup(raw_title):
+    assert _TITLE_STRIP_RE.sub('', raw_title).strip() == "AI Builders Meetup"
+
+
+@pytest.mark.parametrize("raw_title", [
+    "- **AI Builders Meetup**",
+    "### **AI Builders Meetup**",
+    "**[1] AI Builders Meetup**,"
+])
+def test_title_strip_removes_stacked_markup(raw_title):
+    assert _TITLE_STRIP_RE.sub('', raw_title).strip() == "AI Builders Meetup"
+
+
+def test_title_strip_keeps_inner_text():
+    assert _TITLE_STRIP_RE.sub('', "**GenAI - SF Edition, Day 1**").strip() == "GenAI - SF Edition, Day 1"
+
+
+@pytest.mark.parametrize("text, blocks", [
+    (
+        "### AI Meetup\nMay 20, 2025\n\n### Hackathon\n2025-05-21\n",
+        ["### AI Meetup\nMay 20, 2025", "### Hackathon\n2025-05-21"]
+    ),
+    (
+        "- **Event A** - May 20, 2025\n- **Event B** - May 21, 2025\nDetails\n**Event C**\nMore",
+        ["- **Event A** - May 20, 2025", "- **Event B** - May 21, 2025\nDetails", "**Event C**\nMore"]
+    ),
+    (
+        "Intro\n\n\n  * **Indented**\nDetails\n",
+        ["Intro", "* **Indented**\nDetails"]
+    ),
+    (
+        "---QUERY 1---\n### A\nMay 20, 2025\n---QUERY 2---\n* **B**\nMay 21, 2025",
+        ["---QUERY 1---", "### A\nMay 20, 2025\n---QUERY 2---", "* **B**\nMay 21, 2025"]
+    )
+])
+def test_block_split_matches_line_loop(text, blocks):
+    assert split_blocks(text) == blocks
+
+
+FALLBACK_RESPONSE = """---QUERY 1---
+### **AI Builders Meetup**
+Tuesday, May 20, 2025 at 6:00 PM
+Networking for AI founders: https://lu.ma/ai-builders
+
+---QUERY 2---
+**LLM Hackathon**
+May 21, 2025, 10:00 AM
+https://example.com/hack
+
+**Too Late Summit**
+May 27, 2025
+
+In summary, several events run on May 22, 2025.
+"""
+
+
+def test_clean_all_events_falls_back_to_blocks_when_response_is_not_json(researcher):
+    researcher.llm = FakeLLM(FALLBACK_RESPONSE)
+
+    events = researcher._clean_all_events(["first answer", "   ", "second answer"])
+
+    prompt, _ = researcher.llm.calls[0]
+    assert "---QUERY 1---\nfirst answer\n---QUERY 2---\nsecond answer" in prompt
+    assert events == [
+        {"title": "AI Builders Meetup", "date": "2025-05-20", "location": "San Francisco", "url": "https://lu.ma/ai-builders", "type": "Meetup"},
+        {"title": "LLM Hackathon", "date": "2025-05-21", "location": "San Francisco", "url": "https://example.com/hack", "type": "Hackathon"}
+    ]
+
+
+@pytest.mark.parametrize("text", [
+    "Tuesday, May 20, 2025 at 6:00 PM",
+    "Tuesday May 20, 2025 at 6:00 PM",
+    "Tuesday, May 20th, 2025 at 6:00 PM",
+    "May 20, 2025 at 6:00 PM",
+    "2025-05-20 at 6:00 PM"
+])
+def test_extract_event_details_parses_dates_with_and_without_weekday(researcher, text):
+    details = researcher._extract_event_details(text)
+
+    assert details["date_dt"] == datetime(2025, 5, 20)
+    assert details["time"] == "6:00 PM"
+
+
+@pytest.mark.parametrize("date_line", ["Tuesday, May 20, 2025", "Tuesday May 20, 2025"])
+def test_parse_event_blocks_keeps_weekday_dates(researcher, date_line):
+    events = researcher._parse_event_blocks(f"### AI Builders Meetup\n{date_line}\nhttps://lu.ma/ai-builders")
+
+    assert [(event["title"], event["date"]) for event in events] == [("AI Builders Meetup", "2025-05-20")]
+
+
+def test_dedupe_events_matches_on_url_before_title(researcher):
+    events = [
+        {"title": "AI Builders Meetup", "date": "2025-05-20", "url": "https://lu.ma/ai-builders"},
+        {"title": "AI Builders Meetup SF", "date": "2025-05-20", "url": "https://lu.ma/ai-builders"},
+        {"title": "LLM Hackathon", "date": "2025-05-21", "url": None},
+        {"title": "LLM Hackathon", "date": "2025-05-21", "url": None},
+        {"title": "LLM Hackathon", "date": "2025-05-22", "url": None}
+    ]
+
+    assert researcher._dedupe_events(events) == [events[0], events[2], events[4]]
+
+
+def test_fetch_raw_caches_final_answers(researcher, monkeypatch):
+    client = FakeSearchClient({"text": [{"step_type": "FINAL", "content": {"answer": "AI Builders Meetup"}}]})
+    monkeypatch.setattr("agents.researcher._get_search_client", lambda: client)
+
+    assert researcher._fetch_raw("ai events") == "AI Builders Meetup"
+    assert researcher._fetch_raw("ai events") == "AI Builders Meetup"
+    assert client.queries == ["ai events"]
+
+
+def test_fetch_raw_does_not_cache_responses_without_final_answer(researcher, monkeypatch):
+    client = FakeSearchClient({"error": "rate limited"})
+    monkeypatch.setattr("agents.researcher._get_search_client", lambda: client)
+
+    researcher._fetch_raw("ai events")
+    researcher._fetch_raw("ai events")
+
+    assert client.queries == ["ai events", "ai events"]
+    assert researcher.search_cache.get(hashlib.sha1(b"ai events").hexdigest()) is None
+
+
+@pytest.mark.parametrize("start, end, range_query, month_query", [
+    (datetime(2025, 5, 26), datetime(2025, 5, 30), "AI events San Francisco May 26-30 2025", "AI conferences San Francisco May 2025"),
+    (datetime(2025, 6, 30), datetime(2025, 7, 4), "AI events San Francisco June 30-July 4 2025", "AI conferences San Francisco June 2025 and July 2025")
+])
+def test_search_queries_follow_the_target_range(agent_env, start, end, range_query, month_query):
+    agent = ResearcherAgent(target_start=start, target_end=end)
+
+    queries = agent._search_queries()
+
+    assert f"from {start:%B} {start.day} to {end:%B} {end.day}, 2025," in queries[0]
+    assert range_query in queries
+    assert month_query in queries
+    assert not any("May 19" in query for query in queries)
+    agent.search_pool.shutdown()
+
+
+def test_researcher_rejects_weekend_ranges(agent_env):
+    with pytest.raises(ValueError):
+        ResearcherAgent(target_start=datetime(2025, 5, 19), target_end=datetime(2025, 5, 24))
+
+
+def test_stream_clean_ignores_fields_that_are_not_strings(researcher):
+    researcher.llm = FakeLLM(json.dumps({"events": [
+        {"title": "AI Builders Meetup", "date": "2025-05-20", "location": ["SoMa"], "url": ["https://lu.ma/a", "https://lu.ma/b"], "type": {"name": "Meetup"}},
+        {"title": ["LLM Hackathon"], "date": "2025-05-21", "url": "https://example.com/hack"}
+    ]}))
+
+    events = researcher._stream_clean("prompt")
+
+    assert events == [
+        {"title": "AI Builders Meetup", "date": "2025-05-20", "location": "San Francisco", "url": None, "type": "Conference"}
+    ]
+    assert researcher._dedupe_events(events + events) == events
+
+
+def wave_events(count):
+    return json.dumps({"events": [
+        {"title": f"AI Meetup {n}", "date": "2025-05-20", "url": f"https://lu.ma/ai-{n}", "type": "Meetup"}
+        for n in range(count)
+    ]})
+
+
+def test_scrape_events_skips_remaining_queries_once_enough_events_are_found(researcher, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(researcher, "_fetch_raw", lambda query: fetched.append(query) or f"answer for {query}")
+    researcher.llm = FakeLLM(wave_events(researcher.target_event_count))
+
+    events = researcher.scrape_events()
+
+    assert len(events) == researcher.target_event_count
+    assert fetched == researcher._search_queries()[:QUERY_WAVE_SIZE]
+    assert len(researcher.llm.calls) == 1
+
+
+def test_scrape_events_runs_every_query_while_short_of_events(researcher, monkeypatch):
+    fetched = []
+    monkeypatch.setattr(researcher, "_fetch_raw", lambda query: fetched.append(query) or f"answer for {query}")
+    researcher.llm = FakeLLM(wave_events(researcher.target_event_count - 1))
+
+    researcher.scrape_events()
+
+    assert sorted(fetched) == sorted(researcher._search_queries())
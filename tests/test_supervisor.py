@@ -0,0 +1,38 @@
+"""
+Tests for the supervisor's review checks
+"""
+import pytest
+
+from agents.supervisor import SupervisorAgent
+
+EVENTS = [
+    {"title": "AI Builders Meetup", "date": "2025-05-20", "location": "SoMa", "url": "https://lu.ma/ai-builders", "type": "Meetup"},
+    {"title": "LLM Hackathon", "date": "2025-05-21", "location": "Mission", "url": "https://example.com/hack", "type": "Hackathon"}
+]
+
+
+@pytest.fixture
+def supervisor(agent_env):
+    return SupervisorAgent()
+
+
+def test_find_event_issues_passes_clean_events(supervisor):
+    assert supervisor._find_event_issues(EVENTS) == []
+
+
+def test_find_event_issues_flags_an_empty_list(supervisor):
+    assert supervisor._find_event_issues([]) == ["no events found"]
+
+
+@pytest.mark.parametrize("changes, issue", [
+    ({"location": None}, "1 events missing required fields"),
+    ({"url": ""}, "1 events missing required fields"),
+    ({"date": "2025-05-26"}, "1 events outside the target dates"),
+    ({"date": "sometime soon"}, "1 events outside the target dates"),
+    ({"type": "Party"}, "1 events with an unknown category"),
+    ({"url": "https://lu.ma/ai-builders"}, "1 duplicate events")
+])
+def test_find_event_issues_flags_each_problem(supervisor, changes, issue):
+    events = [EVENTS[0], dict(EVENTS[1], **changes)]
+
+    assert supervisor._find_event_issues(events) == [issue]
@@ -0,0 +1,77 @@
+"""
+Tests for the shared agent utilities
+"""
+from datetime import datetime
+
+import pytest
+
+from agents.utils import JsonCache, atomic_write, check_target_range, parse_event_date
+
+
+def test_atomic_write_encodes_utf8(tmp_path):
+    path = str(tmp_path / "events.md")
+
+    atomic_write(path, "Café AI – Tuesday")
+
+    assert (tmp_path / "events.md").read_bytes() == "Café AI – Tuesday".encode("utf-8")
+    assert not (tmp_path / "events.md.tmp").exists()
+
+
+@pytest.mark.parametrize("date_str, expected", [
+    ("2025-05-19", datetime(2025, 5, 19)),
+    ("2025-5-19", datetime(2025, 5, 19)),
+    ("2025-05-9", datetime(2025, 5, 9)),
+    ("May 19, 2025", datetime(2025, 5, 19)),
+    ("Monday, May 19, 2025", datetime(2025, 5, 19)),
+    ("September 3, 2025", datetime(2025, 9, 3)),
+    ("Jun 30, 2025", datetime(2025, 6, 30)),
+    ("Jul 1, 2025", datetime(2025, 7, 1)),
+    ("Sept 3, 2025", datetime(2025, 9, 3)),
+    ("Tuesday, Jul 1, 2025", datetime(2025, 7, 1)),
+    ("Tue, Jul 1, 2025", datetime(2025, 7, 1)),
+    ("Septs 3, 2025", None),
+    ("2025-02-30", None),
+    ("19/05/2025", None),
+    ("", None),
+    (None, None)
+])
+def test_parse_event_date(date_str, expected):
+    assert parse_event_date(date_str) == expected
+
+
+def test_json_cache_round_trips_non_ascii_values(tmp_path):
+    path = str(tmp_path / "cache.json")
+    JsonCache(path, ttl=60).set("query", "Café AI – Tuesday")
+
+    assert JsonCache(path, ttl=60).get("query") == "Café AI – Tuesday"
+
+
+@pytest.mark.parametrize("content", ['[]', '"x"', '{"query": "x"}', '{"query": {"value": "x", "timestamp": "soon"}}'])
+def test_json_cache_treats_malformed_files_as_misses(tmp_path, content):
+    path = tmp_path / "cache.json"
+    path.write_text(content, encoding="utf-8")
+    cache = JsonCache(str(path), ttl=60)
+
+    assert cache.get("query") is None
+    cache.set("other", "value")
+    assert cache.get("other") == "value"
+
+
+@pytest.mark.parametrize("start, end", [
+    (datetime(2025, 5, 19), datetime(2025, 5, 23)),
+    (datetime(2025, 5, 21), datetime(2025, 5, 21)),
+    (datetime(2025, 6, 30), datetime(2025, 7, 4))
+])
+def test_check_target_range_accepts_one_work_week(start, end):
+    check_target_range(start, end)
+
+
+@pytest.mark.parametrize("start, end", [
+    (datetime(2025, 5, 23), datetime(2025, 5, 19)),  # backwards
+    (datetime(2025, 5, 19), datetime(2025, 5, 24)),  # ends on a Saturday
+    (datetime(2025, 5, 22), datetime(2025, 5, 26)),  # spans a weekend
+    (datetime(2025, 5, 19), datetime(2025, 5, 30))   # two weeks
+])
+def test_check_target_range_rejects_other_ranges(start, end):
+    with pytest.raises(ValueError):
+        check_target_range(start, end)